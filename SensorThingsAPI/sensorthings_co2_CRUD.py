@@ -4,7 +4,7 @@ import json
 import logging
 import traceback
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 class SensorThingsManager:
     def __init__(self, base_url):
@@ -135,9 +135,6 @@ class SensorThingsManager:
                 f"{self.base_url}/ObservedProperties?$filter=name eq '{name}'",
                 headers={'Accept': 'application/json'}
             )
-            self.logger.info('asdfasdfasdf')
-            self.logger.info(response.json()['value'][0]['@iot.id'])
-            self.logger.info('asdfasdfasdf')
             if response.status_code == 200:
                 data = response.json()
                 if data.get('value'):
@@ -326,47 +323,54 @@ class SensorThingsManager:
             self.logger.error(f"Error processing CSV: {str(e)}")
             raise
 
+    def setup_location(self, location_name: str = "Default Location",
+                       latitude: float = 0.0, longitude: float = 0.0) -> Tuple[int, int, int]:
+        """Create or fetch the Sensor, Thing and FeatureOfInterest for a location."""
+        # Create or get sensor
+        sensor_id = self.create_sensor()
+        if not sensor_id:
+            raise Exception("Failed to create/fetch sensor")
+
+        # Create Thing for the location
+        thing_properties = {
+            'application': 'Environmental Monitoring',
+            'deployment_date': datetime.now().isoformat(),
+            'location_name': location_name
+        }
+
+        thing_id = self.create_thing(
+            name=f"Environmental Station - {location_name}",
+            description=f"Environmental monitoring station at {location_name}",
+            properties=thing_properties
+        )
+
+        if not thing_id:
+            raise Exception("Failed to create Thing")
+
+        # Create FeatureOfInterest
+        foi_id = self.create_feature_of_interest(
+            name=f"Location - {location_name}",
+            description=f"Monitoring location at {location_name}",
+            location={
+                'coordinates': [longitude, latitude],
+                'type': 'Point'
+            }
+        )
+
+        if not foi_id:
+            raise Exception("Failed to create FeatureOfInterest")
+
+        return sensor_id, thing_id, foi_id
+
     def upload_environmental_data(self, csv_path: str, location_name: str = "Default Location",
                                 latitude: float = 0.0, longitude: float = 0.0):
         """Upload environmental data from CSV to SensorThings API."""
         try:
             # Process CSV
             df = self.process_csv(csv_path)
-            
-            # Create or get sensor
-            sensor_id = self.create_sensor()
-            if not sensor_id:
-                raise Exception("Failed to create/fetch sensor")
-            
-            # Create Thing for the location
-            thing_properties = {
-                'application': 'Environmental Monitoring',
-                'deployment_date': datetime.now().isoformat(),
-                'location_name': location_name
-            }
-            
-            thing_id = self.create_thing(
-                name=f"Environmental Station - {location_name}",
-                description=f"Environmental monitoring station at {location_name}",
-                properties=thing_properties
-            )
-            
-            if not thing_id:
-                raise Exception("Failed to create Thing")
-            
-            # Create FeatureOfInterest
-            foi_id = self.create_feature_of_interest(
-                name=f"Location - {location_name}",
-                description=f"Monitoring location at {location_name}",
-                location={
-                    'coordinates': [longitude, latitude],
-                    'type': 'Point'
-                }
-            )
-            
-            if not foi_id:
-                raise Exception("Failed to create FeatureOfInterest")
-            
+
+            sensor_id, thing_id, foi_id = self.setup_location(location_name, latitude, longitude)
+
             # Create ObservedProperties
             observed_properties = {
                 'CO2': self.create_observed_property(
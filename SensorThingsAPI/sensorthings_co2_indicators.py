@@ -0,0 +1,326 @@
+import numpy as np
+import pandas as pd
+import logging
+from typing import Dict, Optional
+
+from sensorthings_co2_CRUD import SensorThingsManager
+
+# CO2 thresholds (ppm) for exposure minutes
+CO2_THRESHOLDS = [1000, 1400]
+
+# Magnus formula coefficients (Sonntag 1990, valid for -45..60 degC)
+MAGNUS_A = 17.62
+MAGNUS_B = 243.12
+
+# Indicators written back as per-sample Datastreams
+SAMPLE_INDICATORS = {
+    'co2_rolling_8h': {
+        'name': 'CO2 Rolling 8h Mean',
+        'description': 'Rolling 8 hour mean of CO2 concentration',
+        'definition': 'http://example.org/parameters/co2_rolling_8h',
+        'unit': {
+            'name': 'Parts per million',
+            'symbol': 'ppm',
+            'definition': 'http://example.org/units/ppm'
+        }
+    },
+    'dew_point': {
+        'name': 'Dew Point',
+        'description': 'Dew point derived from air temperature and relative humidity',
+        'definition': 'http://example.org/parameters/dew_point',
+        'unit': {
+            'name': 'Degrees Celsius',
+            'symbol': '°C',
+            'definition': 'http://example.org/units/celsius'
+        }
+    }
+}
+
+
+def dew_point(temperature, humidity):
+    """
+    Dew point in degC from temperature (degC) and relative humidity (%) using the Magnus formula
+
+    Humidity readings outside (0, 100] are sensor faults and yield NaN.
+    """
+    temperature = np.asarray(temperature, dtype=float)
+    humidity = np.asarray(humidity, dtype=float)
+    valid = (humidity > 0.0) & (humidity <= 100.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gamma = np.log(humidity / 100.0) + MAGNUS_A * temperature / (MAGNUS_B + temperature)
+        return np.where(valid, MAGNUS_B * gamma / (MAGNUS_A - gamma), np.nan)
+
+
+def compute_indicators(df: pd.DataFrame, rolling_window: str = '8h',
+                       ventilation_window: str = '15min', ventilation_drop: float = 200.0,
+                       ventilation_smoothing: int = 3, max_gap_minutes: float = 15.0) -> pd.DataFrame:
+    """
+    Compute indoor air quality indicators for a DataFrame produced by process_csv
+
+    All indicators are computed column-wise in a single pass over the series.
+
+    :param df: DataFrame with sensor_time, co2, temperature and humidity columns
+    :param rolling_window: Time window of the rolling CO2 mean
+    :param ventilation_window: Look-back window for ventilation detection
+    :param ventilation_drop: CO2 drop (ppm) within the window that counts as ventilation
+    :param ventilation_smoothing: Number of samples in the trailing median used for ventilation detection
+    :param max_gap_minutes: Sample intervals longer than this are clipped (sensor outages)
+    :return: Copy of df sorted by sensor_time with the indicator columns added
+    """
+    result = df.sort_values('sensor_time', kind='stable').reset_index(drop=True)
+    times = result['sensor_time']
+    co2 = pd.to_numeric(result['co2'], errors='coerce')
+
+    # Minutes since the previous sample, attributed to the current reading
+    interval = times.diff().dt.total_seconds().div(60.0)
+    result['interval_minutes'] = interval.fillna(0.0).clip(upper=max_gap_minutes).to_numpy()
+    for threshold in CO2_THRESHOLDS:
+        above = (co2 > threshold).to_numpy()
+        result[f'minutes_above_{threshold}'] = np.where(above, result['interval_minutes'], 0.0)
+
+    # Time based rolling windows over the sensor timestamps
+    co2_by_time = pd.Series(co2.to_numpy(), index=pd.DatetimeIndex(times))
+    result['co2_rolling_8h'] = co2_by_time.rolling(rolling_window, min_periods=1).mean().to_numpy()
+
+    # Ventilation is detected on a trailing median so that single-sample spikes
+    # (e.g. 460 -> 3756 -> 548 ppm) neither raise the peak nor count as a drop.
+    # The first ventilation_smoothing - 1 samples have no median and never trigger.
+    smoothed = co2_by_time.rolling(ventilation_smoothing, min_periods=ventilation_smoothing).median()
+    recent_max = smoothed.rolling(ventilation_window, min_periods=1).max().to_numpy()
+
+    # A ventilation event starts where the smoothed CO2 first falls far enough below its recent peak
+    dropping = (recent_max - smoothed.to_numpy()) >= ventilation_drop
+    previous = np.concatenate(([False], dropping[:-1]))
+    result['ventilation_event'] = dropping & ~previous
+
+    result['dew_point'] = dew_point(result['temperature'], result['humidity'])
+
+    return result
+
+
+def summarize_daily(indicators: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate per-sample indicators into one row per day
+
+    :param indicators: Output of compute_indicators (optionally with a room column)
+    :return: DataFrame with exposure minutes, peak 8h mean and ventilation count per day
+    """
+    keys = [indicators['sensor_time'].dt.floor('D').rename('date')]
+    if 'room' in indicators.columns:
+        keys.insert(0, indicators['room'])
+
+    aggregations = {f'minutes_above_{threshold}': 'sum' for threshold in CO2_THRESHOLDS}
+    aggregations.update({
+        'co2': 'mean',
+        'co2_rolling_8h': 'max',
+        'ventilation_event': 'sum',
+        'dew_point': 'mean'
+    })
+
+    daily = indicators.groupby(keys).agg(aggregations)
+    daily = daily.rename(columns={
+        'co2': 'co2_mean',
+        'co2_rolling_8h': 'co2_rolling_8h_max',
+        'ventilation_event': 'ventilation_events',
+        'dew_point': 'dew_point_mean'
+    })
+    return daily.reset_index()
+
+
+def daily_report(frames: Dict[str, pd.DataFrame], **kwargs) -> pd.DataFrame:
+    """
+    Build a daily indicator report for many rooms
+
+    :param frames: Mapping of room name to DataFrame produced by process_csv
+    :param kwargs: Passed through to compute_indicators
+    :return: Daily summary with one row per room and day
+    """
+    if not frames:
+        return pd.DataFrame()
+
+    indicators = [
+        compute_indicators(df, **kwargs).assign(room=room)
+        for room, df in frames.items()
+    ]
+    return summarize_daily(pd.concat(indicators, ignore_index=True))
+
+
+class IndicatorEngine:
+    def __init__(self, rolling_window: str = '8h', ventilation_window: str = '15min',
+                 ventilation_drop: float = 200.0, ventilation_smoothing: int = 3,
+                 max_gap_minutes: float = 15.0, max_future: str = '1D'):
+        """
+        Incremental indicator computation for a single sensor
+
+        Keeps only the tail of the series that the rolling windows need, so each
+        update recomputes the retained window (8 h by default) plus the new rows
+        instead of the full history. Feeding rows in batches amortizes that cost.
+
+        :param rolling_window: Time window of the rolling CO2 mean
+        :param ventilation_window: Look-back window for ventilation detection
+        :param ventilation_drop: CO2 drop (ppm) within the window that counts as ventilation
+        :param ventilation_smoothing: Number of samples in the trailing median used for ventilation detection
+        :param max_gap_minutes: Sample intervals longer than this are clipped
+        :param max_future: Rows stamped further than this ahead of the current UTC time are
+            rejected; naive timestamps are treated as UTC and the margin absorbs local offsets
+        """
+        self.options = {
+            'rolling_window': rolling_window,
+            'ventilation_window': ventilation_window,
+            'ventilation_drop': ventilation_drop,
+            'ventilation_smoothing': ventilation_smoothing,
+            'max_gap_minutes': max_gap_minutes
+        }
+        self.smoothing = ventilation_smoothing
+        self.max_future = pd.Timedelta(max_future)
+        self.history = max(pd.Timedelta(rolling_window), pd.Timedelta(ventilation_window))
+        self.buffer: Optional[pd.DataFrame] = None
+        self.logger = logging.getLogger(__name__)
+
+    def update(self, new_rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute indicators for newly arrived rows
+
+        :param new_rows: DataFrame in process_csv format, not older than previous updates
+        :return: Indicator rows for new_rows only
+        """
+        new_rows = new_rows.sort_values('sensor_time', kind='stable')
+
+        # Bad sensor clocks would otherwise advance the buffer past all later rows
+        latest_valid = pd.Timestamp.now(tz='UTC') + self.max_future
+        if new_rows['sensor_time'].dt.tz is None:
+            latest_valid = latest_valid.tz_localize(None)
+        future = new_rows['sensor_time'] > latest_valid
+        if future.any():
+            self.logger.warning(f"Rejecting {int(future.sum())} rows stamped after {latest_valid}")
+            new_rows = new_rows[~future]
+
+        if self.buffer is not None and not self.buffer.empty:
+            last_time = self.buffer['sensor_time'].iloc[-1]
+            stale = new_rows['sensor_time'] < last_time
+            if stale.any():
+                self.logger.warning(f"Skipping {int(stale.sum())} rows older than {last_time}")
+                new_rows = new_rows[~stale]
+            combined = pd.concat([self.buffer, new_rows], ignore_index=True)
+            offset = len(self.buffer)
+        else:
+            combined = new_rows.reset_index(drop=True)
+            offset = 0
+
+        if new_rows.empty:
+            return compute_indicators(new_rows, **self.options)
+
+        indicators = compute_indicators(combined, **self.options)
+
+        # Retain the longest window plus enough earlier samples for the interval
+        # and the trailing median of the first sample inside it
+        cutoff = combined['sensor_time'].iloc[-1] - self.history
+        keep_from = max(int((combined['sensor_time'] < cutoff).sum()) - max(self.smoothing - 1, 1), 0)
+        self.buffer = combined.iloc[keep_from:][new_rows.columns].reset_index(drop=True)
+
+        return indicators.iloc[offset:].reset_index(drop=True)
+
+
+def upload_indicators(manager: SensorThingsManager, indicators: pd.DataFrame,
+                      location_name: str = "Default Location",
+                      latitude: float = 0.0, longitude: float = 0.0) -> Dict[str, int]:
+    """
+    Write computed indicators back to the SensorThings API as extra Datastreams
+
+    Per-sample indicators, including the minutes above each CO2 threshold, become
+    one Observation per row; ventilation events are uploaded only where they occur.
+
+    :param manager: SensorThingsManager connected to the FROST server
+    :param indicators: Output of compute_indicators or IndicatorEngine.update
+    :return: Mapping of indicator name to Datastream ID
+    """
+    try:
+        sensor_id, thing_id, foi_id = manager.setup_location(location_name, latitude, longitude)
+
+        streams = dict(SAMPLE_INDICATORS)
+        streams['ventilation_event'] = {
+            'name': 'Ventilation Event',
+            'description': 'Ventilation detected from a CO2 drop',
+            'definition': 'http://example.org/parameters/ventilation_event',
+            'unit': {
+                'name': 'Count',
+                'symbol': '1',
+                'definition': 'http://example.org/units/count'
+            }
+        }
+        for threshold in CO2_THRESHOLDS:
+            streams[f'minutes_above_{threshold}'] = {
+                'name': f'Minutes Above {threshold} ppm',
+                'description': f'Minutes with CO2 above {threshold} ppm since the previous sample',
+                'definition': f'http://example.org/parameters/minutes_above_{threshold}',
+                'unit': {
+                    'name': 'Minutes',
+                    'symbol': 'min',
+                    'definition': 'http://example.org/units/minutes'
+                }
+            }
+
+        datastreams = {}
+        for column, spec in streams.items():
+            observed_property_id = manager.create_observed_property(
+                spec['name'], spec['description'], spec['definition']
+            )
+            if not observed_property_id:
+                raise Exception(f"Failed to create ObservedProperty {spec['name']}")
+
+            datastream_id = manager.create_datastream(
+                name=f"{spec['name']} - {location_name}",
+                description=spec['description'],
+                thing_id=thing_id,
+                observed_property_id=observed_property_id,
+                sensor_id=sensor_id,
+                unit_of_measurement=spec['unit']
+            )
+            if not datastream_id:
+                raise Exception(f"Failed to create Datastream {spec['name']}")
+            datastreams[column] = datastream_id
+
+        timestamps = indicators['sensor_time'].dt.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+
+        sample_columns = list(SAMPLE_INDICATORS)
+        sample_columns += [f'minutes_above_{threshold}' for threshold in CO2_THRESHOLDS]
+        for column in sample_columns:
+            for timestamp, value in zip(timestamps, indicators[column].tolist()):
+                if pd.isna(value):
+                    continue
+                manager.create_observation(
+                    datastream_id=datastreams[column],
+                    result=round(float(value), 2),
+                    phenomenon_time=timestamp,
+                    feature_of_interest_id=foi_id
+                )
+
+        events = indicators['ventilation_event'].to_numpy()
+        for timestamp in np.asarray(timestamps, dtype=object)[events]:
+            manager.create_observation(
+                datastream_id=datastreams['ventilation_event'],
+                result=1,
+                phenomenon_time=timestamp,
+                feature_of_interest_id=foi_id
+            )
+
+        manager.logger.info(f"Successfully uploaded indicators for {location_name}")
+        return datastreams
+
+    except Exception as e:
+        manager.logger.error(f"Error uploading indicators: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    # Configuration
+    BASE_URL = "http://localhost:8080/FROST-Server/v1.1"
+    CSV_FILE_PATH = "CO2sensors_.csv"
+    LOCATION_NAME = "Room A1"
+    LATITUDE = 48.7904  # Example latitude
+    LONGITUDE = 9.1917  # Example longitude
+
+    # Compute indicators and upload them next to the raw measurements
+    manager = SensorThingsManager(BASE_URL)
+    indicators = compute_indicators(manager.process_csv(CSV_FILE_PATH))
+    print(summarize_daily(indicators))
+    upload_indicators(manager, indicators, LOCATION_NAME, LATITUDE, LONGITUDE)
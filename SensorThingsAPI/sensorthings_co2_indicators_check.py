@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from sensorthings_co2_indicators import IndicatorEngine, compute_indicators, dew_point
+
+# Columns that must match between the batch and incremental paths
+CHECKED_COLUMNS = [
+    'interval_minutes', 'minutes_above_1000', 'minutes_above_1400',
+    'co2_rolling_8h', 'ventilation_event', 'dew_point'
+]
+
+
+def read_sensor_csv(csv_path: str) -> pd.DataFrame:
+    """Read a bundled sensor CSV (title line, header, units row) into process_csv format, sorted by sensor_time."""
+    df = pd.read_csv(csv_path, delimiter=';', skiprows=[0, 2])
+    df.columns = ['server_time', 'sensor_time', 'co2', 'temperature', 'humidity']
+    df['server_time'] = pd.to_datetime(df['server_time'])
+    # Sensor time is either "...T...Z" or "... ...+XX"; keep the local wall clock value
+    df['sensor_time'] = pd.to_datetime(df['sensor_time'].str[:19].str.replace('T', ' '))
+    return df.sort_values('sensor_time', kind='stable').reset_index(drop=True)
+
+
+def run_incremental(df: pd.DataFrame, chunk_size: int) -> pd.DataFrame:
+    """Feed df to a fresh IndicatorEngine in chunks and concatenate the results."""
+    engine = IndicatorEngine()
+    parts = [engine.update(df.iloc[start:start + chunk_size]) for start in range(0, len(df), chunk_size)]
+    return pd.concat(parts, ignore_index=True)
+
+
+def check_incremental_matches_batch(csv_path: str, chunk_sizes=(1, 7, 97, 500)):
+    """Incremental output must equal compute_indicators on the same rows."""
+    df = read_sensor_csv(csv_path)
+    # The engine rejects rows stamped in the future, so compare on the rest
+    df = df[df['sensor_time'] <= pd.Timestamp.now()].reset_index(drop=True)
+    # Duplicate a timestamp so that it falls on a chunk boundary
+    df = pd.concat([df.iloc[:8], df.iloc[[7]], df.iloc[8:]], ignore_index=True)
+
+    batch = compute_indicators(df)
+    for chunk_size in chunk_sizes:
+        incremental = run_incremental(df, chunk_size)
+        assert len(incremental) == len(batch), f"{csv_path}: row count differs for chunk size {chunk_size}"
+        for column in CHECKED_COLUMNS:
+            assert np.allclose(incremental[column].astype(float), batch[column].astype(float),
+                               equal_nan=True), f"{csv_path}: {column} differs for chunk size {chunk_size}"
+    print(f"{csv_path}: incremental matches batch for chunk sizes {list(chunk_sizes)}")
+
+
+def check_timezone_aware_input(csv_path: str):
+    """Timezone aware sensor times work in the engine just like naive ones."""
+    df = read_sensor_csv(csv_path)
+    df = df[df['sensor_time'] <= pd.Timestamp.now()].reset_index(drop=True)
+    aware = df.assign(sensor_time=df['sensor_time'].dt.tz_localize('UTC'))
+
+    expected = compute_indicators(df)
+    result = run_incremental(aware, 50)
+    assert np.allclose(result['co2_rolling_8h'], expected['co2_rolling_8h'])
+    print(f"{csv_path}: timezone aware input accepted")
+
+
+def check_spike_is_not_ventilation(csv_path: str):
+    """A single outlier reading (460 -> 3756 -> 548 ppm) is not a ventilation event."""
+    indicators = compute_indicators(read_sensor_csv(csv_path))
+    spike = indicators['sensor_time'] == pd.Timestamp('2020-12-07 19:30:26')
+    assert spike.any() and not indicators.loc[spike, 'ventilation_event'].any()
+    print(f"{csv_path}: outlier spike ignored")
+
+
+def check_dew_point():
+    """Dew point is NaN for humidity outside (0, 100] and plausible otherwise."""
+    result = dew_point([0.0, 20.0, 20.0, 20.0], [0.0, -5.0, 101.0, 50.0])
+    assert np.isnan(result[:3]).all()
+    assert abs(result[3] - 9.26) < 0.05
+    print("dew_point: out of range humidity yields NaN")
+
+
+if __name__ == "__main__":
+    check_dew_point()
+    check_spike_is_not_ventilation('CO2sensors_ESP3d035f.csv')
+    check_timezone_aware_input('CO2sensors_ESP3d035f.csv')
+    for path in ['CO2sensors_ESP3d035f.csv', 'CO2sensors_ESP1a5c94.csv']:
+        check_incremental_matches_batch(path)